@@ -1,10 +1,32 @@
 import sys
-import tempfile
 import math
 import os
-import fitz  # PyMuPDF
+from collections import OrderedDict
 from PyQt5 import QtWidgets, QtGui, QtCore
-from PIL import Image, ImageDraw, ImageFont
+
+# Memory budget for cached scaled page pixmaps, across all zoom levels
+SCALED_CACHE_BYTES = 128 * 1024 * 1024
+
+# Resolution of the base PDF raster (x 72 dpi); this is the page size at 100% zoom
+PDF_RENDER_SCALE = 2.0
+
+# Memory budget for cached balloon stencils, across all zoom levels
+STENCIL_CACHE_BYTES = 16 * 1024 * 1024
+
+# Debounce delays (ms) before a marker-size / zoom change triggers a redraw
+SIZE_DEBOUNCE_MS = 200
+ZOOM_DEBOUNCE_MS = 50
+
+# Idle time (ms) after the last zoom step before the page is smooth-rescaled
+SMOOTH_SETTLE_MS = 250
+
+# Balloon colours: QColor for the canvas / raster saves, 0.0-1.0 tuples for PyMuPDF
+BALLOON_RED = QtGui.QColor(255, 0, 0)
+BALLOON_WHITE = QtGui.QColor(255, 255, 255)
+BALLOON_TEXT = QtGui.QColor(0, 0, 0)
+PDF_RED = (1, 0, 0)
+PDF_WHITE = (1, 1, 1)
+PDF_BLACK = (0, 0, 0)
 
 # ============================================================================
 #  CUSTOM COMPASS WIDGET (New Feature)
@@ -80,6 +102,289 @@ class CompassWidget(QtWidgets.QWidget):
             btn.setChecked(True)
 
 
+# ============================================================================
+#  BACKGROUND WORKERS (PDF rasterization, saving)
+# ============================================================================
+class PdfRasterSignals(QtCore.QObject):
+    """Signals for PdfRasterTask (QRunnable itself cannot emit)."""
+    finished = QtCore.pyqtSignal(int, QtGui.QImage)           # generation, page image (RGB32)
+    failed = QtCore.pyqtSignal(int, str)                      # generation, error message
+
+
+class PdfRasterTask(QtCore.QRunnable):
+    """
+    Renders one PDF page to a QImage on a worker thread.
+    Opens its own fitz document: PyMuPDF objects must not be shared across threads.
+    With `size`, the image is resampled to exactly that (w, h) if fitz's
+    rounding of the page rect comes out a pixel off.
+    """
+    def __init__(self, path, page_index, scale, generation, size=None):
+        super().__init__()
+        self.path = path
+        self.page_index = page_index
+        self.scale = scale
+        self.generation = generation
+        self.size = size
+        self.signals = PdfRasterSignals()
+
+    def run(self):
+        try:
+            import fitz  # PyMuPDF, imported on first PDF use (see save_pdf_vector)
+            doc = fitz.open(self.path)
+            try:
+                page = doc.load_page(self.page_index)
+                pix = page.get_pixmap(matrix=fitz.Matrix(self.scale, self.scale),
+                                      colorspace=fitz.csRGB, alpha=False)
+                # MuPDF hands out packed RGB; convert to Qt's native 32-bit layout
+                # here so QPixmap.fromImage on the GUI thread is a plain wrap.
+                # samples_mv is a view of the fitz buffer (pix.samples would copy
+                # it to bytes first); the conversion below makes the only copy,
+                # so the QImage never outlives `pix`.
+                img = QtGui.QImage(pix.samples_mv, pix.width, pix.height, pix.stride, QtGui.QImage.Format_RGB888)
+                img = img.convertToFormat(QtGui.QImage.Format_RGB32)
+                if self.size is not None and (img.width(), img.height()) != self.size:
+                    img = img.scaled(self.size[0], self.size[1], QtCore.Qt.IgnoreAspectRatio,
+                                     QtCore.Qt.SmoothTransformation)
+            finally:
+                doc.close()
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        self.signals.finished.emit(self.generation, img)
+
+
+class SaveSignals(QtCore.QObject):
+    """Signals for SaveTask."""
+    finished = QtCore.pyqtSignal(str)                         # output path
+    failed = QtCore.pyqtSignal(str, str)                      # output path, error message
+
+
+class SaveTask(QtCore.QRunnable):
+    """
+    Runs save_pdf_vector / save_image_raster on a worker thread.
+    The caller passes snapshots (marker list, size, QImage copy), never widgets.
+    """
+    def __init__(self, save_func, out_path, *args):
+        super().__init__()
+        self.save_func = save_func
+        self.out_path = out_path
+        self.args = args
+        self.signals = SaveSignals()
+
+    def run(self):
+        try:
+            self.save_func(self.out_path, *self.args)
+        except Exception as e:
+            self.signals.failed.emit(self.out_path, str(e))
+            return
+        self.signals.finished.emit(self.out_path)
+
+
+# ============================================================================
+#  BALLOON GEOMETRY & PAINTING (shared by the canvas and raster saves)
+# ============================================================================
+# Unit tail directions for the 8 compass angles, the only ones markers are created with
+BALLOON_DIRECTIONS = {a: (math.cos(math.radians(a)), math.sin(math.radians(a))) for a in range(0, 360, 45)}
+
+
+def balloon_direction(angle_deg):
+    """(dx, dy) unit vector for angle_deg (0 = right, clockwise), from the LUT when possible."""
+    direction = BALLOON_DIRECTIONS.get(angle_deg)
+    if direction is None:
+        theta = math.radians(angle_deg)
+        direction = (math.cos(theta), math.sin(theta))
+    return direction
+
+
+def balloon_center(tip_x, tip_y, angle_deg, r):
+    """Circle centre and tail direction for a balloon whose tail points at (tip_x, tip_y)."""
+    tail_len = int(r * 1.2)
+    dx, dy = balloon_direction(angle_deg)
+    return tip_x - dx * (tail_len + r), tip_y - dy * (tail_len + r), dx, dy
+
+
+def balloon_shape(tip_x, tip_y, angle_deg, r):
+    """Circle centre (QPointF) and tail triangle (QPolygonF) for one balloon."""
+    cx, cy, dx, dy = balloon_center(tip_x, tip_y, angle_deg, r)
+
+    tail_width_offset = r * 0.5
+    pdx, pdy = -dy, dx 
+    
+    p_tip = QtCore.QPointF(tip_x, tip_y)
+    p_base1 = QtCore.QPointF(cx + pdx * tail_width_offset, cy + pdy * tail_width_offset)
+    p_base2 = QtCore.QPointF(cx - pdx * tail_width_offset, cy - pdy * tail_width_offset)
+    return QtCore.QPointF(cx, cy), QtGui.QPolygonF([p_tip, p_base1, p_base2])
+
+
+def paint_circle(painter, center, num, r, border_width, label_stroke=0):
+    """
+    One balloon circle with its number centred inside (font set by the caller).
+    The red ring is a red disc with a white disc on top rather than a stroked
+    ellipse: two antialiased fills skip QPainter's pen stroker and are about
+    twice as fast, with the same outline geometry.
+    A non-zero `label_stroke` also outlines the glyphs with a pen that wide,
+    for the heavier numbers of the saved images.
+    """
+    outer_r = r + border_width / 2
+    inner_r = r - border_width / 2
+    painter.setPen(QtCore.Qt.NoPen)
+    painter.setBrush(BALLOON_RED)
+    painter.drawEllipse(center, outer_r, outer_r)
+    painter.setBrush(BALLOON_WHITE)
+    painter.drawEllipse(center, inner_r, inner_r)
+    if not label_stroke:
+        painter.setPen(BALLOON_TEXT)
+        rect = QtCore.QRectF(center.x() - r, center.y() - r, 2 * r, 2 * r)
+        painter.drawText(rect, QtCore.Qt.AlignCenter, str(num))
+        return
+
+    # Same placement as AlignCenter above: advance width and ascent + descent
+    # centred on the circle, with the glyph outlines stroked, then filled.
+    text = str(num)
+    metrics = QtGui.QFontMetricsF(painter.font())
+    baseline = QtCore.QPointF(center.x() - metrics.horizontalAdvance(text) / 2,
+                              center.y() - metrics.height() / 2 + metrics.ascent())
+    path = QtGui.QPainterPath()
+    path.addText(baseline, painter.font(), text)
+    pen = QtGui.QPen(BALLOON_TEXT, label_stroke)
+    pen.setJoinStyle(QtCore.Qt.RoundJoin)
+    painter.strokePath(path, pen)
+    painter.fillPath(path, BALLOON_TEXT)
+
+
+def paint_balloons(painter, balloons, r, border_width, font, label_stroke=0):
+    """
+    Paints (num, center, tail) balloons in order, each one's tail, circle and
+    number before the next, so later balloons stack on top of earlier ones.
+    """
+    painter.setFont(font)
+    for num, center, tail in balloons:
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(BALLOON_RED)
+        painter.drawPolygon(tail)
+        paint_circle(painter, center, num, r, border_width, label_stroke)
+
+
+# ============================================================================
+#  SAVING (runs on the worker thread via SaveTask)
+# ============================================================================
+def save_pdf_vector(out_path, source_path, markers, r):
+    """
+    Draws markers directly onto the PDF page using PyMuPDF (fitz) vector methods.
+    This ensures 100% crisp quality at any zoom level.
+    """
+    # PyMuPDF costs ~100 ms to import, so it is loaded only once a PDF is
+    # involved; image-only sessions never pay for it.
+    import fitz  # PyMuPDF
+
+    # Create a new handle for the doc to avoid interfering with the open view
+    doc = fitz.open(source_path)
+    page = doc[0]  # Assuming single page for now, or match logic
+
+    page_w = page.rect.width
+    page_h = page.rect.height
+
+    # Sizes are the same for every marker, so work them out once.
+    # r is the marker size in PDF points, roughly equal to screen pixels
+    tail_len = r * 1.2
+    tail_w = r * 0.5
+    border_w = max(1, r / 7)
+    font_size = int(r * 0.9) # Slightly larger for PDF clarity
+    font = fitz.Font("helv") # Standard Helvetica, used to centre the numbers
+
+    # All balloons go into one Shape, drawn in marker order
+    shape = page.new_shape()
+
+    for rx, ry, num, ang in markers:
+        # Calculate positions
+        tip_x = rx * page_w
+        tip_y = ry * page_h
+
+        # --- Draw Pointer (Triangle) ---
+        dx, dy = balloon_direction(ang)
+
+        cx = tip_x - dx * (tail_len + r)
+        cy = tip_y - dy * (tail_len + r)
+
+        # Perpendicular vector for tail width
+        pdx, pdy = -dy, dx
+
+        # Triangle points
+        p_tip = fitz.Point(tip_x, tip_y)
+        p_base1 = fitz.Point(cx + pdx * tail_w, cy + pdy * tail_w)
+        p_base2 = fitz.Point(cx - pdx * tail_w, cy - pdy * tail_w)
+
+        # Draw filled red triangle (no border needed if filled)
+        shape.draw_polyline([p_tip, p_base1, p_base2])
+        shape.finish(color=PDF_RED, fill=PDF_RED, width=0)
+
+        # --- Draw Circle ---
+        # Draw filled white circle with red border
+        shape.draw_circle(fitz.Point(cx, cy), r)
+        shape.finish(color=PDF_RED, fill=PDF_WHITE, width=border_w)
+
+        # --- Draw Text ---
+        # Insert text centered at (cx, cy); insert_text anchors at the baseline-left
+        text_val = str(num)
+
+        # Measure text to center it
+        text_len = font.text_length(text_val, fontsize=font_size)
+        text_x = cx - (text_len / 2)
+        text_y = cy + (font_size * 0.35) # Approximate vertical centering
+
+        shape.insert_text((text_x, text_y), text_val, fontsize=font_size, fontname="helv", color=PDF_BLACK)
+
+        # Shape buffers text separately and appends it after all drawings
+        # on commit; move it into the stream now so each number stays
+        # under the balloons drawn after it.
+        shape.totalcont += shape.text_cont
+        shape.text_cont = ""
+
+    # Every commit rescans the page's content streams, so commit once
+    shape.commit()
+
+    doc.save(out_path)
+    doc.close()
+
+
+def save_image_raster(out_path, image, markers, size):
+    """
+    Saves as PNG/JPG by painting the balloons (antialiased) straight onto a
+    copy of the already-decoded source image. Uses the same geometry and
+    paint order as the on-screen canvas; no second decode from disk.
+    """
+    # 1. Work on the caller's copy of the decoded source (alpha dropped, as JPG cannot hold it)
+    image = image.convertToFormat(QtGui.QImage.Format_RGB32)
+    orig_w, orig_h = image.width(), image.height()
+
+    # 2. Calculate Sizes (balloons grow with the image so they stay legible)
+    scale_factor = max(1.0, orig_w / 1000.0)
+    r = int(size * scale_factor)
+    border_width = max(1.0, r / 8.0)
+    font = QtGui.QFont("Arial")
+    font.setPixelSize(max(1, int(r * 0.9)))
+    font.setBold(True)
+    # Numbers are thickened beyond bold by an outline stroke, r / 30 on each
+    # side, as the Pillow renderer did with stroke_width
+    label_stroke = max(1.0, r / 15.0)
+
+    # 3. Draw all balloons in one painter session
+    balloons = [
+        (num,) + balloon_shape(rx * orig_w, ry * orig_h, ang, r)
+        for rx, ry, num, ang in markers
+    ]
+    painter = QtGui.QPainter(image)
+    painter.setRenderHints(QtGui.QPainter.Antialiasing | QtGui.QPainter.TextAntialiasing)
+    paint_balloons(painter, balloons, r, border_width, font, label_stroke)
+    painter.end()
+
+    # 4. Save (format from the file extension; for PNG, Qt's "quality" is
+    #    the compression level, so only JPG gets an explicit value)
+    quality = 95 if out_path.lower().endswith((".jpg", ".jpeg")) else -1
+    if not image.save(out_path, None, quality):
+        raise OSError(f"Could not write image: {out_path}")
+
+
 # ============================================================================
 #  MAIN APPLICATION
 # ============================================================================
@@ -89,7 +394,7 @@ class Canvas(QtWidgets.QWidget):
     High-Performance Canvas.
     Renders markers dynamically on top of the image without modifying pixel data.
     """
-    marker_added = QtCore.pyqtSignal(int, int)
+    marker_added = QtCore.pyqtSignal(float, float)  # click position relative to the image (0-1)
 
     def __init__(self):
         super().__init__()
@@ -98,12 +403,27 @@ class Canvas(QtWidgets.QWidget):
         
         self.circle_radius = 20
         self.number_font_size = 12
+        self.number_font = QtGui.QFont("Arial", self.number_font_size, QtGui.QFont.Bold)
         self.border_thickness = 2
+
+        # Per-marker geometry cache, rebuilt only when markers or layout change
+        self._balloons = None
+        self._balloons_key = None
+        self._balloon_bounds = []  # widget-space QRect per cached balloon
+
+        # Pre-rendered circle + number pixmaps, keyed by (num, radius, device
+        # pixel ratio), least recently used first. Only the label differs
+        # between balloons of one size, so each number is rasterized once per
+        # zoom level and repaints are plain blits.
+        self._stencils = OrderedDict()
+        self._stencil_bytes = 0
         
         self.setMouseTracking(True)
         self.setCursor(QtCore.Qt.CrossCursor)
         self.setSizePolicy(QtWidgets.QSizePolicy.Ignored, QtWidgets.QSizePolicy.Ignored)
         self.setAttribute(QtCore.Qt.WA_AcceptTouchEvents)
+        # paintEvent fills every pixel itself, so skip Qt's background erase
+        self.setAttribute(QtCore.Qt.WA_OpaquePaintEvent)
 
     def update_view(self, pixmap, markers, radius):
         self.pixmap_item = pixmap
@@ -111,7 +431,10 @@ class Canvas(QtWidgets.QWidget):
         self.circle_radius = radius
         
         self.border_thickness = max(1, int(radius / 7.5))
-        self.number_font_size = int(radius * 0.9)
+        if int(radius * 0.9) != self.number_font_size:
+            self.number_font_size = int(radius * 0.9)
+            self.number_font = QtGui.QFont("Arial", self.number_font_size, QtGui.QFont.Bold)
+        self._balloons = None
         
         if self.pixmap_item:
             self.setMinimumSize(self.pixmap_item.width(), self.pixmap_item.height())
@@ -142,42 +465,103 @@ class Canvas(QtWidgets.QWidget):
         painter.drawPixmap(img_rect.topLeft(), self.pixmap_item)
 
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        font = QtGui.QFont("Arial", self.number_font_size, QtGui.QFont.Bold)
-        painter.setFont(font)
-
-        for rel_x, rel_y, num, angle in self.markers:
-            tip_x = img_rect.x() + (rel_x * img_rect.width())
-            tip_y = img_rect.y() + (rel_y * img_rect.height())
-            self._draw_single_balloon(painter, num, tip_x, tip_y, angle)
-
-    def _draw_single_balloon(self, painter, num, tip_x, tip_y, angle_deg):
-        r = self.circle_radius
-        tail_len = int(r * 1.2)
-        theta = math.radians(angle_deg)
-        dx = math.cos(theta)
-        dy = math.sin(theta)
-
-        cx = tip_x - dx * (tail_len + r)
-        cy = tip_y - dy * (tail_len + r)
 
-        tail_width_offset = r * 0.5
-        pdx, pdy = -dy, dx 
-        
-        p_tip = QtCore.QPointF(tip_x, tip_y)
-        p_base1 = QtCore.QPointF(cx + pdx * tail_width_offset, cy + pdy * tail_width_offset)
-        p_base2 = QtCore.QPointF(cx - pdx * tail_width_offset, cy - pdy * tail_width_offset)
+        # Marker edits and scrolling expose small areas; Qt clips to them, but
+        # skipping the balloons outside also skips their draw calls.
+        balloons = self._layout_balloons(img_rect)
+        exposed = event.rect()
+        if exposed != self.rect():
+            balloons = [b for b, bounds in zip(balloons, self._balloon_bounds) if bounds.intersects(exposed)]
 
+        # Each balloon's tail goes down right before its circle, so later
+        # balloons stack on top of earlier ones as in the saves. drawPixmap
+        # ignores the brush, so the tail brush is set once per frame.
         painter.setPen(QtCore.Qt.NoPen)
-        painter.setBrush(QtGui.QColor(255, 0, 0))
-        painter.drawPolygon(QtGui.QPolygonF([p_tip, p_base1, p_base2]))
+        painter.setBrush(BALLOON_RED)
+        half = self._stencil_half()
+        for num, center, tail in balloons:
+            painter.drawPolygon(tail)
+            painter.drawPixmap(QtCore.QPointF(center.x() - half, center.y() - half), self._stencil(num))
 
-        painter.setPen(QtGui.QPen(QtGui.QColor(255, 0, 0), self.border_thickness))
-        painter.setBrush(QtGui.QColor(255, 255, 255))
-        painter.drawEllipse(QtCore.QPointF(cx, cy), r, r)
+    def _stencil_half(self):
+        """Half the side of a stencil: radius plus half the ring plus an antialiasing pixel."""
+        return math.ceil(self.circle_radius + self.border_thickness / 2) + 1
 
-        painter.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0)))
-        rect = QtCore.QRectF(cx - r, cy - r, 2 * r, 2 * r)
-        painter.drawText(rect, QtCore.Qt.AlignCenter, str(num))
+    def _stencil(self, num):
+        """
+        Returns the cached circle + number pixmap for `num` at the current size.
+        Stencils for other radii stay cached (within STENCIL_CACHE_BYTES), so
+        zooming back and forth does not re-render every balloon.
+        """
+        dpr = self.devicePixelRatioF()
+        key = (num, self.circle_radius, dpr)
+        stencil = self._stencils.get(key)
+        if stencil is not None:
+            self._stencils.move_to_end(key)
+        else:
+            half = self._stencil_half()
+            side = math.ceil(2 * half * dpr)
+            stencil = QtGui.QPixmap(side, side)
+            stencil.setDevicePixelRatio(dpr)
+            stencil.fill(QtCore.Qt.transparent)
+
+            painter = QtGui.QPainter(stencil)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            painter.setFont(self.number_font)
+            paint_circle(painter, QtCore.QPointF(half, half), num, self.circle_radius, self.border_thickness)
+            painter.end()
+
+            self._stencils[key] = stencil
+            self._stencil_bytes += side * side * 4
+            while self._stencil_bytes > STENCIL_CACHE_BYTES and len(self._stencils) > 1:
+                _, old = self._stencils.popitem(last=False)
+                self._stencil_bytes -= old.width() * old.height() * 4
+        return stencil
+
+    def _layout_balloons(self, img_rect):
+        """
+        Returns (num, center, tail) for every marker in widget coordinates.
+        Scrolling and partial repaints reuse the cached list; it is rebuilt
+        only after markers change or the image moves/rescales.
+        """
+        key = (img_rect.x(), img_rect.y(), img_rect.width(), img_rect.height())
+        if self._balloons is None or self._balloons_key != key:
+            x0, y0 = img_rect.x(), img_rect.y()
+            iw, ih = img_rect.width(), img_rect.height()
+            self._balloons = [
+                (num,) + balloon_shape(x0 + (rel_x * iw), y0 + (rel_y * ih), angle, self.circle_radius)
+                for rel_x, rel_y, num, angle in self.markers
+            ]
+            self._balloon_bounds = [
+                self._balloon_bounds_rect(tail[0].x(), tail[0].y(), center.x(), center.y())
+                for _, center, tail in self._balloons
+            ]
+            self._balloons_key = key
+        return self._balloons
+
+    def marker_rect(self, marker):
+        """Widget-space bounding box of one balloon (tip, tail and circle)."""
+        rel_x, rel_y, _, angle = marker
+        img_rect = self.get_image_rect()
+        tip_x = img_rect.x() + (rel_x * img_rect.width())
+        tip_y = img_rect.y() + (rel_y * img_rect.height())
+        cx, cy, _, _ = balloon_center(tip_x, tip_y, angle, self.circle_radius)
+        return self._balloon_bounds_rect(tip_x, tip_y, cx, cy)
+
+    def _balloon_bounds_rect(self, tip_x, tip_y, cx, cy):
+        # Pad for the pen width and antialiasing fringe
+        r = self.circle_radius + self.border_thickness + 2
+        top_left = QtCore.QPointF(min(tip_x, cx - r), min(tip_y, cy - r))
+        bottom_right = QtCore.QPointF(max(tip_x, cx + r), max(tip_y, cy + r))
+        return QtCore.QRectF(top_left, bottom_right).toAlignedRect()
+
+    def refresh_markers(self, markers):
+        """Repaint only the area covered by the given markers."""
+        self._balloons = None
+        region = QtGui.QRegion()
+        for marker in markers:
+            region += self.marker_rect(marker)
+        self.update(region)
 
     def mousePressEvent(self, event):
         if not self.pixmap_item: return
@@ -186,7 +570,7 @@ class Canvas(QtWidgets.QWidget):
             x = event.x() - img_rect.x()
             y = event.y() - img_rect.y()
             if 0 <= x < img_rect.width() and 0 <= y < img_rect.height():
-                self.marker_added.emit(x, y)
+                self.marker_added.emit(x / img_rect.width(), y / img_rect.height())
 
 
 class MainWindow(QtWidgets.QMainWindow):
@@ -198,8 +582,9 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.source_path = None
         self.source_type = None
-        self.source_doc = None      
         self.base_pixmap = None     
+        self._scaled_cache = OrderedDict()  # (w, h) -> scaled QPixmap, least recently used first
+        self._scaled_bytes = 0
         
         self.markers = []           
         self.undone_markers = []
@@ -207,6 +592,35 @@ class MainWindow(QtWidgets.QMainWindow):
         self.zoom_level = 1.0
         self.current_rotation = 0 # Default 0 (Right)
 
+        # PDF pages are rasterized off the GUI thread. One worker keeps fitz
+        # calls serialized; the generation counter discards stale results
+        # when another file is opened before a render finishes.
+        self._raster_pool = QtCore.QThreadPool(self)
+        self._raster_pool.setMaxThreadCount(1)
+        self._raster_generation = 0
+        self._raster_task = None
+
+        # Zoomed PDF views are re-rendered by fitz at the displayed size
+        # instead of resampling base_pixmap; at most one such render is queued.
+        self._view_task = None
+        self._view_task_key = None
+        # View tasks are owned here, not by the pool; ones that started before
+        # being superseded or delivered stay referenced until the pool is idle,
+        # so none is freed while its run() is still unwinding.
+        self._retired_view_tasks = []
+        self._save_task = None
+
+        # Coalesces bursts of marker-size / zoom changes into one view refresh
+        self._view_debounce = QtCore.QTimer(self)
+        self._view_debounce.setSingleShot(True)
+        self._view_debounce.timeout.connect(lambda: self.update_view_request(smooth=False))
+
+        # While zooming the canvas shows a fast nearest-neighbour preview;
+        # the smooth rescale runs once the zoom level stops changing.
+        self._smooth_timer = QtCore.QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.timeout.connect(self.update_view_request)
+
         # UI Components
         self.canvas = Canvas()
         self.canvas.marker_added.connect(self.add_marker)
@@ -291,7 +705,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.spin_size = QtWidgets.QSpinBox()
         self.spin_size.setRange(10, 100)
         self.spin_size.setValue(20)
-        self.spin_size.valueChanged.connect(self.update_view_request)
+        self.spin_size.valueChanged.connect(self.update_marker_size)
         toolbar.addWidget(self.spin_size)
 
     # =========================================================================
@@ -318,7 +732,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.zoom_level += scale_factor * 1.5 
                 if self.zoom_level < 0.1: self.zoom_level = 0.1
                 if self.zoom_level > 5.0: self.zoom_level = 5.0
-                self.update_view_request()
+                self._schedule_zoom()
                 return True
         return super().event(event)
 
@@ -330,69 +744,184 @@ class MainWindow(QtWidgets.QMainWindow):
         self.source_path = path
         self.markers = []
         self.undone_markers = []
+        self._scaled_cache.clear()
+        self._scaled_bytes = 0
+        
+        self._raster_generation += 1
         
         if path.lower().endswith(".pdf"):
             self.source_type = 'pdf'
-            self.source_doc = fitz.open(path)
-            page = self.source_doc.load_page(0)
-            pix = page.get_pixmap(matrix=fitz.Matrix(2.0, 2.0)) 
-            img = QtGui.QImage(pix.samples, pix.width, pix.height, pix.stride, QtGui.QImage.Format_RGB888)
-            self.base_pixmap = QtGui.QPixmap.fromImage(img)
+            self.base_pixmap = None
+            self.canvas.update_view(None, self.markers, self.canvas.circle_radius)
+            self._raster_task = PdfRasterTask(path, 0, PDF_RENDER_SCALE, self._raster_generation)
+            self._raster_task.signals.finished.connect(self._on_pdf_rendered)
+            self._raster_task.signals.failed.connect(self._on_pdf_failed)
+            self._raster_pool.start(self._raster_task)
+            self.status_label.setText(f"Loading: {os.path.basename(path)}...")
         else:
             self.source_type = 'image'
-            self.source_doc = None
             self.base_pixmap = QtGui.QPixmap(path)
+            self._show_loaded_source()
+
+    def _on_pdf_rendered(self, generation, img):
+        if generation != self._raster_generation: return  # Superseded by a newer open
+        self.base_pixmap = QtGui.QPixmap.fromImage(img)
+        self._show_loaded_source()
+
+    def _on_pdf_failed(self, generation, message):
+        if generation != self._raster_generation: return
+        self.source_path = None
+        self.status_label.setText("Ready")
+        QtWidgets.QMessageBox.warning(self, "Error", f"Could not open PDF:\n{message}")
 
+    def _show_loaded_source(self):
         self.zoom_level = 1.0 if self.base_pixmap.width() < 1500 else 0.5 
         self.update_view_request()
-        self.status_label.setText(f"Loaded: {os.path.basename(path)}")
+        self.status_label.setText(f"Loaded: {os.path.basename(self.source_path)}")
 
-    def update_view_request(self):
+    def _view_size(self):
+        return (int(self.base_pixmap.width() * self.zoom_level),
+                int(self.base_pixmap.height() * self.zoom_level))
+
+    def update_view_request(self, smooth=True):
         if not self.base_pixmap: return
-        w = int(self.base_pixmap.width() * self.zoom_level)
-        h = int(self.base_pixmap.height() * self.zoom_level)
+        w, h = self._view_size()
         if w <= 0 or h <= 0: return
 
-        scaled = self.base_pixmap.scaled(w, h, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        scaled = self._scaled_pixmap(w, h, smooth)
         visual_radius = int(self.spin_size.value() * self.zoom_level)
         self.canvas.update_view(scaled, self.markers, visual_radius)
         self.zoom_label.setText(f"  {int(self.zoom_level*100)}%  ")
 
-    def add_marker(self, x, y):
-        view_w = self.canvas.pixmap_item.width()
-        view_h = self.canvas.pixmap_item.height()
-        rel_x = x / view_w
-        rel_y = y / view_h
-        
+    def _scaled_pixmap(self, w, h, smooth=True):
+        """
+        Returns base_pixmap scaled to (w, h). The last few zoom levels are kept,
+        so marker-size tweaks and zooming back and forth skip the smooth rescale.
+        With smooth=False an uncached size gets an uncached fast preview and the
+        smooth rescale is deferred until zooming settles.
+        """
+        key = (w, h)
+        scaled = self._scaled_cache.get(key)
+        if scaled is not None:
+            self._scaled_cache.move_to_end(key)
+            return scaled
+
+        if not smooth:
+            self._smooth_timer.start(SMOOTH_SETTLE_MS)
+            return self.base_pixmap.scaled(w, h, QtCore.Qt.KeepAspectRatio, QtCore.Qt.FastTransformation)
+
+        if self.source_type == 'pdf' and key != (self.base_pixmap.width(), self.base_pixmap.height()):
+            # Vector page: render it at this size on the worker (a few ms for
+            # fitz, and sharp when zoomed in) and preview until it arrives.
+            self._render_pdf_view(w, h)
+            return self.base_pixmap.scaled(w, h, QtCore.Qt.KeepAspectRatio, QtCore.Qt.FastTransformation)
+
+        scaled = self.base_pixmap.scaled(w, h, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        self._cache_scaled(key, scaled)
+        return scaled
+
+    def _cache_scaled(self, key, scaled):
+        """
+        Files `scaled` under `key`, then drops the least recently used pages
+        until the cache fits SCALED_CACHE_BYTES. A page costs w * h * 4 bytes,
+        so deep zoom levels push out several shallow ones; the page for the
+        current zoom is never dropped.
+        """
+        old = self._scaled_cache.pop(key, None)
+        if old is not None:
+            self._scaled_bytes -= old.width() * old.height() * 4
+        self._scaled_cache[key] = scaled
+        self._scaled_bytes += scaled.width() * scaled.height() * 4
+
+        current = self._view_size()
+        for old_key in list(self._scaled_cache):
+            if self._scaled_bytes <= SCALED_CACHE_BYTES: break
+            if old_key == current: continue
+            old = self._scaled_cache.pop(old_key)
+            self._scaled_bytes -= old.width() * old.height() * 4
+
+    def _render_pdf_view(self, w, h):
+        """Queues a fitz render of the open page at (w, h), replacing any queued one."""
+        key = (w, h)
+        if self._view_task is not None:
+            if self._view_task_key == key: return
+            if not self._raster_pool.tryTake(self._view_task):  # already started
+                self._retired_view_tasks.append(self._view_task)
+
+        scale = PDF_RENDER_SCALE * w / self.base_pixmap.width()
+        task = PdfRasterTask(self.source_path, 0, scale, self._raster_generation, size=key)
+        task.setAutoDelete(False)  # see _retired_view_tasks
+        task.signals.finished.connect(lambda generation, img: self._on_pdf_view_rendered(generation, key, img))
+        task.signals.failed.connect(lambda generation, message: self._on_pdf_view_rendered(generation, key, None))
+        self._view_task = task
+        self._view_task_key = key
+        self._raster_pool.start(task)
+
+    def _on_pdf_view_rendered(self, generation, key, img):
+        if self._view_task_key == key:
+            self._retired_view_tasks.append(self._view_task)
+            self._view_task = None
+            self._view_task_key = None
+        if self._raster_pool.activeThreadCount() == 0:
+            self._retired_view_tasks.clear()
+        if generation != self._raster_generation: return  # Another file was opened
+
+        if img is None:
+            # Re-render failed; fall back to resampling the base raster
+            scaled = self.base_pixmap.scaled(key[0], key[1], QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        else:
+            scaled = QtGui.QPixmap.fromImage(img)
+        self._cache_scaled(key, scaled)
+        if key == self._view_size():
+            self.update_view_request()
+
+    def add_marker(self, rel_x, rel_y):
         count = len(self.markers) + 1
-        self.markers.append((rel_x, rel_y, count, self.current_rotation))
+        marker = (rel_x, rel_y, count, self.current_rotation)
+        self.markers.append(marker)
         self.undone_markers.clear()
-        self.canvas.update() 
+        self.canvas.refresh_markers([marker])
         self.status_label.setText(f"Marker {count} added")
 
     def undo_marker(self):
         if self.markers:
-            self.undone_markers.append(self.markers.pop())
-            self.canvas.update()
+            marker = self.markers.pop()
+            self.undone_markers.append(marker)
+            self.canvas.refresh_markers([marker])
 
     def redo_marker(self):
         if self.undone_markers:
-            self.markers.append(self.undone_markers.pop())
-            self.canvas.update()
+            marker = self.undone_markers.pop()
+            self.markers.append(marker)
+            self.canvas.refresh_markers([marker])
 
     def clear_all_markers(self):
+        self.canvas.refresh_markers(self.markers)
         self.markers.clear()
         self.undone_markers.clear()
-        self.canvas.update()
+
+    def update_marker_size(self, value):
+        """Spinbox arrows fire per step; redraw once the user pauses."""
+        self._view_debounce.start(SIZE_DEBOUNCE_MS)
 
     def zoom_in(self):
         self.zoom_level += 0.1
-        self.update_view_request()
+        self._schedule_zoom()
 
     def zoom_out(self):
         if self.zoom_level > 0.1:
             self.zoom_level -= 0.1
-            self.update_view_request()
+            self._schedule_zoom()
+
+    def _schedule_zoom(self):
+        """
+        Show the new percentage right away and fold further zoom steps (wheel
+        ticks, pinch updates) into one preview refresh every ZOOM_DEBOUNCE_MS,
+        so a continuous gesture keeps updating without rescaling per event.
+        """
+        self.zoom_label.setText(f"  {int(self.zoom_level*100)}%  ")
+        if not self._view_debounce.isActive():
+            self._view_debounce.start(ZOOM_DEBOUNCE_MS)
 
     def save_file(self):
         if not self.source_path or not self.markers:
@@ -416,205 +945,28 @@ class MainWindow(QtWidgets.QMainWindow):
         - If PDF: Draws vector shapes (resolution independent).
         - If Image: Draws high-res raster shapes scaled to image size.
         """
+        # Runs on the raster worker, which also keeps fitz use on one thread;
+        # the markers and source image are copied so edits made meanwhile
+        # don't leak into the file.
+        markers = list(self.markers)
+        size = self.spin_size.value()
         if self.source_type == 'pdf':
-            self._save_pdf_vector(out_path)
+            task = SaveTask(save_pdf_vector, out_path, self.source_path, markers, size)
         else:
-            self._save_image_raster(out_path)
-
+            task = SaveTask(save_image_raster, out_path, self.base_pixmap.toImage(), markers, size)
+        task.signals.finished.connect(self._on_saved)
+        task.signals.failed.connect(self._on_save_failed)
+        self._save_task = task
+        self._raster_pool.start(task)
+        self.status_label.setText(f"Saving: {os.path.basename(out_path)}...")
+
+    def _on_saved(self, out_path):
         self.status_label.setText(f"Saved to {out_path}")
         QtWidgets.QMessageBox.information(self, "Saved", "File saved successfully.")
 
-    def _save_pdf_vector(self, out_path):
-        """
-        Draws markers directly onto the PDF page using PyMuPDF (fitz) vector methods.
-        This ensures 100% crisp quality at any zoom level.
-        """
-        # Create a new handle for the doc to avoid interfering with the open view
-        # or just use the existing self.source_doc but save to a new path
-        doc = fitz.open(self.source_path)
-        page = doc[0]  # Assuming single page for now, or match logic
-        
-        page_w = page.rect.width
-        page_h = page.rect.height
-
-        # Base size from slider
-        base_size = self.spin_size.value()
-        
-        # Define color (PyMuPDF uses 0.0-1.0 float tuples for colors)
-        red = (1, 0, 0)
-        white = (1, 1, 1)
-        black = (0, 0, 0)
-
-        for rx, ry, num, ang in self.markers:
-            # Calculate positions
-            tip_x = rx * page_w
-            tip_y = ry * page_h
-            r = base_size # In PDF points, roughly equal to screen pixels
-            
-            # --- Draw Pointer (Triangle) ---
-            tail_len = r * 1.2
-            theta = math.radians(ang)
-            dx = math.cos(theta)
-            dy = math.sin(theta)
-
-            cx = tip_x - dx * (tail_len + r)
-            cy = tip_y - dy * (tail_len + r)
-            
-            # Perpendicular vector for tail width
-            pdx, pdy = -dy, dx
-            tail_w = r * 0.5
-            
-            # Triangle points
-            p_tip = fitz.Point(tip_x, tip_y)
-            p_base1 = fitz.Point(cx + pdx * tail_w, cy + pdy * tail_w)
-            p_base2 = fitz.Point(cx - pdx * tail_w, cy - pdy * tail_w)
-            
-            # Draw filled red triangle (no border needed if filled)
-            shape = page.new_shape()
-            shape.draw_poly([p_tip, p_base1, p_base2])
-            shape.finish(color=red, fill=red, width=0)
-            shape.commit()
-
-            # --- Draw Circle ---
-            # Draw filled white circle with red border
-            shape = page.new_shape()
-            shape.draw_circle(fitz.Point(cx, cy), r)
-            shape.finish(color=red, fill=white, width=max(1, r/7))
-            shape.commit()
-
-            # --- Draw Text ---
-            # Insert text centered at (cx, cy)
-            # PyMuPDF insert_text anchor is bottom-left usually, or we use text_writer
-            font_size = int(r * 0.9) # Slightly larger for PDF clarity
-            
-            # Text alignment logic
-            text_val = str(num)
-            
-            # We use a TextWriter to center alignment easily
-            tw = fitz.TextWriter(page.rect)
-            font = fitz.Font("helv") # Standard Helvetica
-            
-            # Measure text to center it
-            text_len = font.text_length(text_val, fontsize=font_size)
-            text_x = cx - (text_len / 2)
-            text_y = cy + (font_size * 0.35) # Approximate vertical centering
-            
-            page.insert_text((text_x, text_y), text_val, fontsize=font_size, fontname="helv", color=black)
-
-        doc.save(out_path)
-        doc.close()
-
-    def _save_image_raster(self, out_path):
-        """
-        Saves as PNG/JPG using 4x Super-Sampling with corrected text size.
-        """
-        print(f"--- SAVING IMAGE TO: {out_path} ---")
-
-        # 1. Load the base image
-        base_img = Image.open(self.source_path).convert("RGBA")
-        orig_w, orig_h = base_img.size
-        
-        # 2. Setup Super-Sampling (4x resolution)
-        SUPERSAMPLE = 4
-        super_w = orig_w * SUPERSAMPLE
-        super_h = orig_h * SUPERSAMPLE
-        
-        # Create a transparent overlay for high-quality drawing
-        overlay = Image.new("RGBA", (super_w, super_h), (255, 255, 255, 0))
-        draw = ImageDraw.Draw(overlay)
-        
-        # 3. Calculate Sizes
-        scale_factor = max(1.0, orig_w / 1000.0)
-        user_r = self.spin_size.value()
-        final_r = int(user_r * scale_factor * SUPERSAMPLE)
-
-        # --- SIZE FIX IS HERE ---
-        # WAS: int(final_r * 1.3)  <-- This was too big
-        # NOW: int(final_r * 0.75) <-- This fits perfectly inside the circle
-        font_size = int(final_r * 0.9)
-        
-        print(f"DEBUG: Radius={final_r}, Font Size={font_size}")
-
-        # 4. Load High-Res Font
-        font = None
-        font_candidates = [
-            "arial.ttf", "Arial.ttf", 
-            "/Library/Fonts/Arial.ttf", 
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 
-            "C:\\Windows\\Fonts\\arial.ttf"
-        ]
-        
-        for f_path in font_candidates:
-            try:
-                font = ImageFont.truetype(f_path, font_size)
-                break
-            except OSError:
-                continue
-                
-        if font is None:
-            print("WARNING: Default font used (Size might look wrong)")
-            font = ImageFont.load_default()
-
-        # 5. Draw on the Giant Overlay
-        for rx, ry, num, ang in self.markers:
-            self._pil_draw_balloon(draw, rx, ry, num, ang, super_w, super_h, final_r, font, 1.0)
-
-        # 6. Shrink Overlay back to Original Size
-        overlay_smooth = overlay.resize((orig_w, orig_h), resample=Image.Resampling.LANCZOS)
-        
-        # 7. Composite and Save
-        final_img = Image.alpha_composite(base_img, overlay_smooth)
-        final_img.convert("RGB").save(out_path, quality=95)
-        print("--- SAVE COMPLETE ---")
-
-    def _pil_draw_balloon(self, draw, rx, ry, num, angle, w, h, r, font, scale):
-        """
-        Draws the balloon with thin edges but THICK numbers.
-        """
-        tip_x, tip_y = rx * w, ry * h
-        tail_len = int(r * 1.2)
-        theta = math.radians(angle)
-        dx, dy = math.cos(theta), math.sin(theta)
-        
-        cx = tip_x - dx * (tail_len + r)
-        cy = tip_y - dy * (tail_len + r)
-        
-        pdx, pdy = -dy, dx
-        tail_w = r * 0.5
-        
-        # 1. CIRCLE THICKNESS (Thinner)
-        # Higher number = Thinner line (e.g. 10.0 or 12.0)
-        circle_thickness = max(2, int(r / 8.0))
-        
-        # 2. NUMBER THICKNESS (Thicker)
-        # We simulate BOLD by adding a stroke width.
-        # Lower number = Thicker text (e.g. r / 20.0 is very bold, r / 40.0 is medium)
-        text_stroke = max(1, int(r / 30.0))
-
-        # Draw Tail (Triangle)
-        p1 = (tip_x, tip_y)
-        p2 = (cx + pdx * tail_w, cy + pdy * tail_w)
-        p3 = (cx - pdx * tail_w, cy - pdy * tail_w)
-        draw.polygon([p1, p2, p3], fill=(255, 0, 0))
-        
-        # Draw Circle
-        bbox = [cx - r, cy - r, cx + r, cy + r]
-        draw.ellipse(bbox, fill=(255, 255, 255), outline=(255, 0, 0), width=circle_thickness)
-        
-        # Draw Text
-        text_str = str(num)
-        try:
-            left, top, right, bottom = draw.textbbox((0, 0), text_str, font=font, stroke_width=text_stroke)
-            tw = right - left
-            th = bottom - top
-            # Adjust Y slightly because stroke makes text taller
-            text_pos = (cx - tw / 2, cy - th / 2 - (th * 0.1)) 
-        except AttributeError:
-            tw, th = draw.textsize(text_str, font=font, stroke_width=text_stroke)
-            text_pos = (cx - tw / 2, cy - th / 2)
-
-        # Draw text with stroke_width to make it BOLD
-        draw.text(text_pos, text_str, font=font, fill=(0, 0, 0), stroke_width=text_stroke, stroke_fill=(0, 0, 0))
+    def _on_save_failed(self, out_path, message):
+        self.status_label.setText("Save failed")
+        QtWidgets.QMessageBox.warning(self, "Error", f"Could not save {os.path.basename(out_path)}:\n{message}")
 
 
 if __name__ == "__main__":